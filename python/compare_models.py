@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# Copyright 2025 Arduino PT2D Project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+模型比較工具
+
+功能：
+1) 在同一驗證集上分別評估舊模型與新模型（mAP50 / mAP50-95 / precision / recall）
+2) 比較推理速度（val 報告的每張推理毫秒數）
+3) 輸出比較結果到 model_comparison.json
+
+說明：
+- 若硬體支援（Nvidia GPU），會先將 .pt 權重導出為 TensorRT engine 再驗證，
+  以 tensor core + 融合核心取得 2-4x 吞吐量；導出失敗時自動退回 .pt 推理
+- engine 檔以 (imgsz, batch, half) 為鍵緩存，重複執行不會重新導出
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+try:
+    import orjson  # 序列化比 stdlib json 快 3-10x，且原生支援 numpy 標量
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit  # 數值迴圈 JIT 編譯（可選依賴）
+except ImportError:
+    njit = None
+
+import numpy as np
+import torch
+from ultralytics import YOLO
+
+# 固定 320×320 輸入形狀，讓 cuDNN 自動選擇最快的卷積算法
+torch.backends.cudnn.benchmark = True
+
+# 驗證參數（與訓練時的小目標設定一致）
+VAL_IMGSZ = 320
+VAL_BATCH = 16
+
+
+def _half_supported() -> bool:
+    """是否啟用 FP16 驗證（Volta/Turing 以後的 tensor core 才有收益）"""
+    return torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 7
+
+# 比較的品質指標欄位（順序即輸出順序）與顯示名稱
+METRIC_FIELDS = ['mAP50', 'mAP50_95', 'precision', 'recall']
+METRIC_LABELS = {'mAP50_95': 'mAP50-95'}
+
+
+@dataclass(slots=True, frozen=True)
+class Metrics:
+    """單一模型的驗證指標（slots：省去 per-instance dict，屬性訪問更快）"""
+    mAP50: float
+    mAP50_95: float
+    precision: float
+    recall: float
+    inference_ms: float
+
+
+@dataclass(slots=True, frozen=True)
+class Improvement:
+    """單一指標的變化量（絕對差值與百分比）"""
+    diff: float
+    pct: float
+
+# 驗證結果緩存目錄（以 模型+數據集+參數 雜湊為鍵）
+VAL_CACHE_DIR = Path('.val_cache')
+
+
+def _hash_file(key, path: Path):
+    """將檔案內容餵入雜湊器，不一次性讀入整個檔案
+
+    權重檔可達數百 MB，open().read() 會讓峰值 RSS 翻倍；
+    file_digest（Py3.11+）內部用固定緩衝區串流，舊版退回分塊讀取。
+    """
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            key.update(hashlib.file_digest(f, 'blake2b').digest())
+        else:
+            while chunk := f.read(1 << 20):
+                key.update(chunk)
+
+
+def _val_cache_key(model_path: Path, data_yaml: Path, imgsz: int, batch: int) -> str:
+    """計算驗證結果的緩存鍵（blake2b：大權重檔上比 sha256 快）"""
+    key = hashlib.blake2b(digest_size=16)
+    _hash_file(key, model_path)
+    _hash_file(key, data_yaml)
+    key.update(f'{imgsz}-{batch}-rect'.encode())
+    return key.hexdigest()
+
+
+def compare_metrics(old, new):
+    """
+    計算指標差異與百分比變化
+
+    供本腳本與批次模型掃描等其他工具共用；安裝 numba 時會被
+    JIT 編譯（見下方裝飾），4 元素場景收益可忽略，大批次掃描有感。
+    """
+    diff = new - old
+    pct = np.zeros_like(diff)
+    for i in range(diff.shape[0]):
+        if old[i] > 0:
+            pct[i] = diff[i] / old[i] * 100.0
+    return diff, pct
+
+
+if njit is not None:
+    compare_metrics = njit(cache=True, fastmath=True)(compare_metrics)
+
+
+def _engine_cache_path(model_path: Path, imgsz: int, batch: int, precision: str) -> Path:
+    """以 (imgsz, batch, 精度) 為鍵的 engine 緩存路徑"""
+    tag = f"_{imgsz}_{batch}_{precision}"
+    return model_path.with_name(model_path.stem + tag + ".engine")
+
+
+def load_model(model_path: Path, imgsz: int = VAL_IMGSZ, batch: int = VAL_BATCH,
+               int8: bool = False, data_yaml: Path | None = None) -> YOLO:
+    """
+    載入模型，優先使用 TensorRT engine
+
+    .pt 權重以 eager PyTorch 推理是整個腳本的主要開銷；
+    在 Nvidia 硬體上導出 TensorRT FP16 engine 後再驗證可大幅提速，
+    int8=True 時再疊加 INT8 量化（以 data_yaml 為校準集，mAP 會略有變動）。
+    導出失敗（無 GPU / 無 TensorRT）時退回原始 .pt。
+    """
+    if model_path.suffix != '.pt':
+        return YOLO(str(model_path), task='detect')
+
+    precision = 'int8' if int8 else 'fp16'
+    engine_path = _engine_cache_path(model_path, imgsz, batch, precision)
+    try:
+        if not engine_path.exists():
+            print(f"[EXPORT] 導出 TensorRT engine ({precision}): "
+                  f"{model_path.name} → {engine_path.name}")
+            export_kwargs = dict(format='engine', imgsz=imgsz, batch=batch,
+                                 dynamic=False, device=0)
+            if int8:
+                export_kwargs.update(int8=True, data=str(data_yaml) if data_yaml else None)
+            else:
+                export_kwargs.update(half=True)
+            exported = YOLO(str(model_path)).export(**export_kwargs)
+            # export 回傳實際輸出路徑，改名到緩存鍵位置
+            Path(exported).replace(engine_path)
+        return YOLO(str(engine_path), task='detect')
+    except Exception as e:
+        print(f"[WARN] TensorRT 導出失敗，退回 PyTorch 推理: {e}")
+        return YOLO(str(model_path))
+
+
+def _auto_batch(imgsz: int = VAL_IMGSZ) -> int:
+    """
+    依可用 VRAM 自動選擇驗證 batch
+
+    batch=16 @ 320px 無法餵飽現代 GPU，啟動開銷佔比過高；
+    以每張影像的張量大小粗估，放大到 VRAM 允許的上限（最多 64）。
+    無 GPU 時維持預設 VAL_BATCH。
+    """
+    if not torch.cuda.is_available():
+        return VAL_BATCH
+    try:
+        free_bytes, _ = torch.cuda.mem_get_info()
+        bytes_per_px = 2 if _half_supported() else 4
+        # 張量本體外，activations 約放大一個數量級，保守除以 16
+        per_image = 3 * imgsz * imgsz * bytes_per_px * 16
+        return max(VAL_BATCH, min(64, int(free_bytes // per_image)))
+    except Exception:
+        return VAL_BATCH
+
+
+def _warmup(model: YOLO, imgsz: int = VAL_IMGSZ, runs: int = 3):
+    """
+    預熱模型，讓計時反映穩態速度
+
+    首個 batch 包含 kernel autotuning / TensorRT context 分配等冷啟動開銷，
+    會灌水 val_results.speed；先跑幾次 dummy 推理把這些開銷排除在計時外。
+    """
+    dummy = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+    for _ in range(runs):
+        model.predict(dummy, imgsz=imgsz, verbose=False)
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+
+
+def _evaluate(label: str, model_path: Path, data_yaml: Path, stream=None,
+              imgsz: int = VAL_IMGSZ, int8: bool = False) -> Metrics:
+    """評估單一模型，返回 Metrics；stream 非 None 時在該 CUDA stream 上執行"""
+    batch = _auto_batch(imgsz)
+
+    # 模型與數據集都沒變時直接取用上次的驗證結果，省下整個 val 迴圈
+    precision_tag = 'int8' if int8 else 'fp16'
+    cache_file = VAL_CACHE_DIR / (
+        f"{_val_cache_key(model_path, data_yaml, imgsz, batch)}-{precision_tag}.json")
+    if cache_file.exists():
+        print(f"\n[CACHE] {label} 驗證結果緩存命中: {cache_file.name}")
+        return Metrics(**json.loads(cache_file.read_text(encoding='utf-8')))
+
+    model = load_model(model_path, imgsz=imgsz, batch=batch, int8=int8, data_yaml=data_yaml)
+    _warmup(model, imgsz)
+    print(f"\n[VAL] 評估{label}: {model_path} (imgsz={imgsz}, batch={batch}, rect=True)")
+
+    def _run():
+        return model.val(
+            data=str(data_yaml), imgsz=imgsz, batch=batch,
+            rect=True, workers=max(1, (os.cpu_count() or 2) // 2), cache='ram',
+            half=_half_supported(),
+            device=0 if torch.cuda.is_available() else 'cpu',
+            verbose=False)
+
+    if stream is not None:
+        with torch.cuda.stream(stream):
+            val_results = _run()
+    else:
+        val_results = _run()
+
+    metrics = Metrics(
+        mAP50=float(val_results.box.map50),
+        mAP50_95=float(val_results.box.map),
+        precision=float(val_results.box.mp),
+        recall=float(val_results.box.mr),
+        inference_ms=float(val_results.speed['inference']),
+    )
+
+    VAL_CACHE_DIR.mkdir(exist_ok=True)
+    cache_file.write_text(json.dumps(asdict(metrics)), encoding='utf-8')
+    return metrics
+
+
+def compare_models(old_model_path: Path, new_model_path: Path, data_yaml: Path,
+                   concurrent: bool = False, imgsz: int = VAL_IMGSZ,
+                   int8: bool = False) -> dict:
+    """評估兩個模型並計算指標差異"""
+    pairs = [('舊模型', old_model_path), ('新模型', new_model_path)]
+
+    if concurrent and torch.cuda.is_available():
+        # 兩個模型各走一條 CUDA stream 同時驗證，
+        # 讓一方的 CPU 前處理/NMS 與另一方的 GPU 前向重疊（VRAM 需求加倍）
+        from concurrent.futures import ThreadPoolExecutor
+        streams = [torch.cuda.Stream(), torch.cuda.Stream()]
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(_evaluate, label, path, data_yaml, stream,
+                                   imgsz, int8)
+                       for (label, path), stream in zip(pairs, streams)]
+            results = {label: fut.result()
+                       for (label, _), fut in zip(pairs, futures)}
+        torch.cuda.synchronize()
+    else:
+        results = {label: _evaluate(label, path, data_yaml, imgsz=imgsz, int8=int8)
+                   for label, path in pairs}
+
+    # 計算各指標的差異與百分比變化（共用的向量化/JIT 輔助函數）
+    old_vals = np.array([getattr(results['舊模型'], m) for m in METRIC_FIELDS])
+    new_vals = np.array([getattr(results['新模型'], m) for m in METRIC_FIELDS])
+    diffs, pcts = compare_metrics(old_vals, new_vals)
+
+    improvements = {m: Improvement(diff=d, pct=p)
+                    for m, d, p in zip(METRIC_FIELDS, diffs.tolist(), pcts.tolist())}
+
+    print("\n" + "=" * 60)
+    print("指標比較（新模型 vs 舊模型）")
+    print("=" * 60)
+    for metric, old_val, new_val, diff, pct in zip(
+            METRIC_FIELDS, old_vals.tolist(), new_vals.tolist(), diffs.tolist(), pcts.tolist()):
+        label = METRIC_LABELS.get(metric, metric)
+        sign = '+' if diff >= 0 else ''
+        print(f"  {label:<10} {old_val:.4f} → {new_val:.4f} ({sign}{diff:.4f}, {sign}{pct:.1f}%)")
+
+    # 速度比較（毫秒，越低越好）
+    old_ms = results['舊模型'].inference_ms
+    new_ms = results['新模型'].inference_ms
+    speed_diff = new_ms - old_ms
+    speed_pct = (speed_diff / old_ms * 100) if old_ms > 0 else 0
+    improvements['inference_ms'] = Improvement(diff=speed_diff, pct=speed_pct)
+    print(f"  {'inference':<10} {old_ms:.1f}ms → {new_ms:.1f}ms ({speed_pct:+.1f}%)")
+
+    return {'results': results, 'improvements': improvements}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較舊模型與新模型的 mAP 與推理速度")
+    parser.add_argument("--old", default="models/mosquito_yolov8.pt", help="舊模型權重路徑")
+    parser.add_argument("--new", default="models/mosquito_yolov8_new.pt", help="新模型權重路徑")
+    parser.add_argument("--data", default="dataset/data.yaml", help="驗證集 data.yaml 路徑")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="兩模型併行驗證（CUDA streams，VRAM 需求加倍）")
+    parser.add_argument("--imgsz", type=int, default=VAL_IMGSZ,
+                        help="驗證輸入解析度（160 可再大幅提速，小目標 mAP 會下降）")
+    parser.add_argument("--int8", action="store_true",
+                        help="TensorRT INT8 量化（以驗證集校準；mAP 略變，"
+                             "建議同時保留 FP16 基準欄）")
+    args = parser.parse_args()
+
+    old_model_path = Path(args.old).resolve()
+    new_model_path = Path(args.new).resolve()
+    data_yaml = Path(args.data).resolve()
+
+    for p in (old_model_path, new_model_path, data_yaml):
+        if not p.exists():
+            print(f"[ERROR] 找不到文件: {p}")
+            sys.exit(1)
+
+    # 預先觸發 numba 編譯（cache=True 時僅首次執行有成本）
+    compare_metrics(np.zeros(1), np.zeros(1))
+
+    try:
+        comparison = compare_models(old_model_path, new_model_path, data_yaml,
+                                    concurrent=args.concurrent,
+                                    imgsz=args.imgsz, int8=args.int8)
+    except Exception as e:
+        print(f"\n[ERROR] 模型比較失敗: {e}")
+        sys.exit(1)
+
+    # 輸出比較結果（供部署決策與記錄）
+    output_path = Path('model_comparison.json')
+    if orjson is not None:
+        # orjson 直接輸出 UTF-8 bytes，避開 stdlib 的非 ASCII 慢路徑，
+        # 且原生序列化 dataclass / numpy 標量（免去 asdict 中間層）
+        output_path.write_bytes(orjson.dumps(
+            comparison, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        payload = {
+            'results': {k: asdict(v) for k, v in comparison['results'].items()},
+            'improvements': {k: asdict(v) for k, v in comparison['improvements'].items()},
+        }
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ 比較結果已保存至: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,8 +19,45 @@
 
 import os
 import configparser
+import json
 import socket
-from pathlib import Path
+from functools import cached_property, lru_cache
+from pathlib import Path, PureWindowsPath
+
+try:
+    import orjson  # JSON 快照的快速解析路徑（可選依賴）
+except ImportError:
+    orjson = None
+
+
+@lru_cache(maxsize=1)
+def _get_local_ip():
+    """自動偵測本機 IP 地址（結果緩存，僅探測一次）"""
+    try:
+        # 連接到外部伺服器以獲取本機實際 IP（不會真正發送數據）
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # 路由異常時快速失敗，避免在嵌入式設備上長時間阻塞
+        s.settimeout(0.1)
+        s.connect(("8.8.8.8", 80))
+        ip = s.getsockname()[0]
+        s.close()
+        return ip
+    except Exception:
+        # 備用方案：嘗試獲取主機名稱對應的 IP
+        try:
+            return socket.gethostbyname(socket.gethostname())
+        except Exception:
+            return "127.0.0.1"
+
+
+def _BOOL(value: str) -> bool:
+    """將 ini 字串轉為布林值（與 configparser.getboolean 同語義）"""
+    if isinstance(value, bool):
+        return value
+    try:
+        return configparser.ConfigParser.BOOLEAN_STATES[value.lower()]
+    except KeyError:
+        raise ValueError(f"非布林值: {value!r}")
 
 
 class ConfigLoader:
@@ -47,11 +84,13 @@ class ConfigLoader:
         if config_path:
             candidates.append(Path(config_path))
 
-        # 3) 模組所在目錄（python/）
+        # 3) 模組所在目錄（python/）；.json 快照優先（冷啟動解析快一個數量級）
         module_dir = Path(__file__).resolve().parent
+        candidates.append(module_dir / "mosquito.json")
         candidates.append(module_dir / "mosquito.ini")
 
         # 4) 當前工作目錄
+        candidates.append(Path.cwd() / "mosquito.json")
         candidates.append(Path.cwd() / "mosquito.ini")
 
         # 選擇首個存在的配置文件
@@ -69,25 +108,35 @@ class ConfigLoader:
         self.config_path = chosen
 
         # 讀取配置文件
-        self.config.read(self.config_path, encoding='utf-8')
+        self._load()
         # 基準目錄（用於解析相對路徑）
         self._config_base_dir = self.config_path.parent
 
-    def _get_local_ip(self):
-        """自動偵測本機 IP 地址"""
+    def _load(self):
+        """讀取配置文件並快照為巢狀 dict
+
+        屬性讀取走純 dict 查找，避開 configparser 的 SectionProxy
+        正則與大小寫折疊開銷；.json 快照更直接跳過 configparser 解析。
+        """
+        if self.config_path.suffix == '.json':
+            raw = self.config_path.read_bytes()
+            self._data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        else:
+            self.config.read(self.config_path, encoding='utf-8')
+            self._data = {s: dict(self.config.items(s)) for s in self.config.sections()}
+
+    def _get(self, section: str, key: str, cast, fallback):
+        """從快照讀取配置值並轉型，缺失時返回 fallback"""
         try:
-            # 連接到外部伺服器以獲取本機實際 IP（不會真正發送數據）
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            ip = s.getsockname()[0]
-            s.close()
-            return ip
-        except Exception:
-            # 備用方案：嘗試獲取主機名稱對應的 IP
-            try:
-                return socket.gethostbyname(socket.gethostname())
-            except Exception:
-                return "127.0.0.1"
+            return cast(self._data[section][key])
+        except KeyError:
+            return fallback
+
+    def invalidate(self):
+        """清除所有已緩存的配置值（重新載入配置文件後調用）"""
+        for name, attr in type(self).__dict__.items():
+            if isinstance(attr, cached_property):
+                self.__dict__.pop(name, None)
 
     # 內部工具：將相對路徑解析到 sample_collection_dir 之下
     def _resolve_under_sample_base(self, value: str) -> str:
@@ -99,366 +148,437 @@ class ConfigLoader:
         return str((base / p).resolve())
 
     # AI檢測相關配置
-    @property
+    @cached_property
     def imgsz(self):
-        return self.config.getint('AI_DETECTION', 'imgsz', fallback=640)
+        return self._get('AI_DETECTION', 'imgsz', int, 640)
 
-    @property
+    @cached_property
     def confidence_threshold(self):
-        return self.config.getfloat('AI_DETECTION', 'confidence_threshold', fallback=0.4)
+        return self._get('AI_DETECTION', 'confidence_threshold', float, 0.4)
 
-    @property
+    @cached_property
     def iou_threshold(self):
-        return self.config.getfloat('AI_DETECTION', 'iou_threshold', fallback=0.45)
+        return self._get('AI_DETECTION', 'iou_threshold', float, 0.45)
 
-    @property
+    @cached_property
     def detection_mode(self):
-        return self.config.get('AI_DETECTION', 'detection_mode', fallback='tiling')
+        return self._get('AI_DETECTION', 'detection_mode', str, 'tiling')
 
-    @property
+    @cached_property
     def tile_overlap(self):
-        return self.config.getfloat('AI_DETECTION', 'tile_overlap', fallback=0.25)
+        return self._get('AI_DETECTION', 'tile_overlap', float, 0.25)
 
-    @property
+    @cached_property
     def detection_margin(self):
-        return self.config.getfloat('AI_DETECTION', 'detection_margin', fallback=0.0)
+        return self._get('AI_DETECTION', 'detection_margin', float, 0.0)
 
-    @property
+    @cached_property
     def min_mosquito_size_mm(self):
-        return self.config.getint('AI_DETECTION', 'min_mosquito_size_mm', fallback=3)
+        return self._get('AI_DETECTION', 'min_mosquito_size_mm', int, 3)
 
-    @property
+    @cached_property
     def max_mosquito_size_mm(self):
-        return self.config.getint('AI_DETECTION', 'max_mosquito_size_mm', fallback=15)
+        return self._get('AI_DETECTION', 'max_mosquito_size_mm', int, 15)
 
-    @property
+    @cached_property
     def enable_white_pixel_filter(self):
-        return self.config.getboolean('AI_DETECTION', 'enable_white_pixel_filter', fallback=True)
+        return self._get('AI_DETECTION', 'enable_white_pixel_filter', _BOOL, True)
 
-    @property
+    @cached_property
     def white_pixel_threshold(self):
-        return self.config.getint('AI_DETECTION', 'white_pixel_threshold', fallback=240)
+        return self._get('AI_DETECTION', 'white_pixel_threshold', int, 240)
 
-    @property
+    @cached_property
     def white_pixel_ratio_threshold(self):
-        return self.config.getfloat('AI_DETECTION', 'white_pixel_ratio_threshold', fallback=0.7)
+        return self._get('AI_DETECTION', 'white_pixel_ratio_threshold', float, 0.7)
 
     # 單目過濾器相關配置
-    @property
+    @cached_property
     def enable_bbox_size_filter(self):
-        return self.config.getboolean('SINGLE_CAMERA_FILTER', 'enable_bbox_size_filter', fallback=True)
+        return self._get('SINGLE_CAMERA_FILTER', 'enable_bbox_size_filter', _BOOL, True)
 
-    @property
+    @cached_property
     def min_bbox_size_px(self):
-        return self.config.getint('SINGLE_CAMERA_FILTER', 'min_bbox_size_px', fallback=10)
+        return self._get('SINGLE_CAMERA_FILTER', 'min_bbox_size_px', int, 10)
 
-    @property
+    @cached_property
     def max_bbox_size_px(self):
-        return self.config.getint('SINGLE_CAMERA_FILTER', 'max_bbox_size_px', fallback=200)
+        return self._get('SINGLE_CAMERA_FILTER', 'max_bbox_size_px', int, 200)
 
-    @property
+    @cached_property
     def enable_aspect_ratio_filter(self):
-        return self.config.getboolean('SINGLE_CAMERA_FILTER', 'enable_aspect_ratio_filter', fallback=True)
+        return self._get('SINGLE_CAMERA_FILTER', 'enable_aspect_ratio_filter', _BOOL, True)
 
-    @property
+    @cached_property
     def min_aspect_ratio(self):
-        return self.config.getfloat('SINGLE_CAMERA_FILTER', 'min_aspect_ratio', fallback=0.3)
+        return self._get('SINGLE_CAMERA_FILTER', 'min_aspect_ratio', float, 0.3)
 
-    @property
+    @cached_property
     def max_aspect_ratio(self):
-        return self.config.getfloat('SINGLE_CAMERA_FILTER', 'max_aspect_ratio', fallback=3.0)
+        return self._get('SINGLE_CAMERA_FILTER', 'max_aspect_ratio', float, 3.0)
 
-    @property
+    @cached_property
     def enable_temporal_filter(self):
-        return self.config.getboolean('SINGLE_CAMERA_FILTER', 'enable_temporal_filter', fallback=True)
+        return self._get('SINGLE_CAMERA_FILTER', 'enable_temporal_filter', _BOOL, True)
 
-    @property
+    @cached_property
     def min_consecutive_frames(self):
-        return self.config.getint('SINGLE_CAMERA_FILTER', 'min_consecutive_frames', fallback=3)
+        return self._get('SINGLE_CAMERA_FILTER', 'min_consecutive_frames', int, 3)
 
-    @property
+    @cached_property
     def enable_motion_filter(self):
-        return self.config.getboolean('SINGLE_CAMERA_FILTER', 'enable_motion_filter', fallback=True)
+        return self._get('SINGLE_CAMERA_FILTER', 'enable_motion_filter', _BOOL, True)
 
-    @property
+    @cached_property
     def max_movement_px_per_frame(self):
-        return self.config.getint('SINGLE_CAMERA_FILTER', 'max_movement_px_per_frame', fallback=150)
+        return self._get('SINGLE_CAMERA_FILTER', 'max_movement_px_per_frame', int, 150)
 
-    @property
+    @cached_property
     def max_static_frames(self):
-        return self.config.getint('SINGLE_CAMERA_FILTER', 'max_static_frames', fallback=60)
+        return self._get('SINGLE_CAMERA_FILTER', 'max_static_frames', int, 60)
 
-    @property
+    @cached_property
     def static_threshold_px(self):
-        return self.config.getint('SINGLE_CAMERA_FILTER', 'static_threshold_px', fallback=5)
+        return self._get('SINGLE_CAMERA_FILTER', 'static_threshold_px', int, 5)
 
     # 追蹤相關配置
-    @property
+    @cached_property
     def pan_gain(self):
-        return self.config.getfloat('TRACKING', 'pan_gain', fallback=0.15)
+        return self._get('TRACKING', 'pan_gain', float, 0.15)
 
-    @property
+    @cached_property
     def tilt_gain(self):
-        return self.config.getfloat('TRACKING', 'tilt_gain', fallback=0.15)
+        return self._get('TRACKING', 'tilt_gain', float, 0.15)
 
-    @property
+    @cached_property
     def no_detection_timeout(self):
-        return self.config.getfloat('TRACKING', 'no_detection_timeout', fallback=3.0)
+        return self._get('TRACKING', 'no_detection_timeout', float, 3.0)
 
-    @property
+    @cached_property
     def target_lock_distance(self):
-        return self.config.getint('TRACKING', 'target_lock_distance', fallback=100)
+        return self._get('TRACKING', 'target_lock_distance', int, 100)
 
     # 硬體相關配置
-    @property
+    @cached_property
     def arduino_port(self):
-        return self.config.get('HARDWARE', 'arduino_port', fallback='/dev/ttyUSB0')
+        return self._get('HARDWARE', 'arduino_port', str, '/dev/ttyUSB0')
 
-    @property
+    @cached_property
     def left_camera_id(self):
-        return self.config.getint('HARDWARE', 'left_camera_id', fallback=0)
+        return self._get('HARDWARE', 'left_camera_id', int, 0)
 
-    @property
+    @cached_property
     def pan_servo_id(self):
-        return self.config.getint('HARDWARE', 'pan_servo_id', fallback=1)
+        return self._get('HARDWARE', 'pan_servo_id', int, 1)
 
-    @property
+    @cached_property
     def tilt_servo_id(self):
-        return self.config.getint('HARDWARE', 'tilt_servo_id', fallback=2)
+        return self._get('HARDWARE', 'tilt_servo_id', int, 2)
 
     # 這裏移除了 right_camera_id 屬性，因為我們不再支援獨立攝像頭模式
 
     # 警報相關配置
-    @property
+    @cached_property
     def beep_cooldown(self):
-        return self.config.getfloat('ALERTS', 'beep_cooldown', fallback=2.0)
+        return self._get('ALERTS', 'beep_cooldown', float, 2.0)
 
-    @property
+    @cached_property
     def laser_cooldown(self):
-        return self.config.getfloat('ALERTS', 'laser_cooldown', fallback=0.5)
+        return self._get('ALERTS', 'laser_cooldown', float, 0.5)
 
     # 樣本收集相關配置
-    @property
+    @cached_property
     def save_high_confidence_samples(self):
-        return self.config.getboolean('SAMPLE_COLLECTION', 'save_high_confidence_samples', fallback=False)
+        return self._get('SAMPLE_COLLECTION', 'save_high_confidence_samples', _BOOL, False)
 
-    @property
+    @cached_property
     def save_uncertain_samples(self):
-        return self.config.getboolean('SAMPLE_COLLECTION', 'save_uncertain_samples', fallback=True)
+        return self._get('SAMPLE_COLLECTION', 'save_uncertain_samples', _BOOL, True)
 
-    @property
+    @cached_property
     def uncertain_conf_range(self):
-        min_val = self.config.getfloat('SAMPLE_COLLECTION', 'uncertain_conf_range_min', fallback=0.4)
-        max_val = self.config.getfloat('SAMPLE_COLLECTION', 'uncertain_conf_range_max', fallback=0.7)
+        min_val = self._get('SAMPLE_COLLECTION', 'uncertain_conf_range_min', float, 0.4)
+        max_val = self._get('SAMPLE_COLLECTION', 'uncertain_conf_range_max', float, 0.7)
         return (min_val, max_val)
 
-    @property
+    @cached_property
     def max_samples(self):
-        return self.config.getint('SAMPLE_COLLECTION', 'max_samples', fallback=1000)
+        return self._get('SAMPLE_COLLECTION', 'max_samples', int, 1000)
 
-    @property
+    @cached_property
     def save_interval(self):
-        return self.config.getfloat('SAMPLE_COLLECTION', 'save_interval', fallback=3.0)
+        return self._get('SAMPLE_COLLECTION', 'save_interval', float, 3.0)
 
-    @property
+    @cached_property
     def save_annotations(self):
-        return self.config.getboolean('SAMPLE_COLLECTION', 'save_annotations', fallback=True)
+        return self._get('SAMPLE_COLLECTION', 'save_annotations', _BOOL, True)
 
-    @property
+    @cached_property
     def save_full_frame(self):
-        return self.config.getboolean('SAMPLE_COLLECTION', 'save_full_frame', fallback=False)
+        return self._get('SAMPLE_COLLECTION', 'save_full_frame', _BOOL, False)
 
     # 樣本標註相關配置
-    @property
+    @cached_property
     def sample_collection_dir(self):
-        raw = self.config.get('SAMPLE_ANNOTATION', 'sample_collection_dir', fallback="sample_collection")
+        raw = self._get('SAMPLE_ANNOTATION', 'sample_collection_dir', str, "sample_collection")
         p = Path(raw)
         # 將相對路徑錨定到配置檔所在目錄，避免 CWD 影響
         if not p.is_absolute():
             p = (self._config_base_dir / p).resolve()
         return str(p)
 
-    @property
+    @cached_property
     def medium_confidence_dir(self):
-        raw = self.config.get('SAMPLE_ANNOTATION', 'medium_confidence_dir', fallback="medium_confidence")
+        raw = self._get('SAMPLE_ANNOTATION', 'medium_confidence_dir', str, "medium_confidence")
         return self._resolve_under_sample_base(raw)
 
-    @property
+    @cached_property
     def high_confidence_dir(self):
-        raw = self.config.get('SAMPLE_ANNOTATION', 'high_confidence_dir', fallback="high_confidence")
+        raw = self._get('SAMPLE_ANNOTATION', 'high_confidence_dir', str, "high_confidence")
         return self._resolve_under_sample_base(raw)
 
-    @property
+    @cached_property
     def confirmed_mosquito_dir(self):
-        raw = self.config.get('SAMPLE_ANNOTATION', 'confirmed_mosquito_dir', fallback="confirmed/mosquito")
+        raw = self._get('SAMPLE_ANNOTATION', 'confirmed_mosquito_dir', str, "confirmed/mosquito")
         return self._resolve_under_sample_base(raw)
 
-    @property
+    @cached_property
     def confirmed_not_mosquito_dir(self):
-        raw = self.config.get('SAMPLE_ANNOTATION', 'confirmed_not_mosquito_dir', fallback="confirmed/not_mosquito")
+        raw = self._get('SAMPLE_ANNOTATION', 'confirmed_not_mosquito_dir', str, "confirmed/not_mosquito")
         return self._resolve_under_sample_base(raw)
 
+    # 內部工具：正規化 ini 中的路徑值
+    # - 支援 Windows 反斜線寫法（如 G:\我的雲端硬碟\...），在非 Windows 平台
+    #   透過 PureWindowsPath 解析一次，下游不必逐次處理反斜線
+    # - 相對路徑錨定到配置檔所在目錄（與 sample_collection_dir 同語義）
+    def _normalize_path(self, raw: str) -> str:
+        if '\\' in raw and os.sep != '\\':
+            p = Path(PureWindowsPath(raw).as_posix())
+        else:
+            p = Path(raw)
+        if not p.is_absolute():
+            p = self._config_base_dir / p
+        return os.fspath(p)
+
     # 樣本標註相關配置 (用於 label_samples.py)
-    @property
+    @cached_property
     def RELOCATION_BASE_DIR(self):
-        return self.config.get('SAMPLE_ANNOTATION', 'relocation_base_dir', fallback="./relocated_samples")
+        raw = self._get('SAMPLE_ANNOTATION', 'relocation_base_dir', str, "./relocated_samples")
+        return self._normalize_path(raw)
 
-    @property
+    @cached_property
     def RELOCATION_MOSQUITO_DIR(self):
-        return self.config.get('SAMPLE_ANNOTATION', 'relocation_mosquito_dir', fallback="relocated_samples/mosquito")
+        raw = self._get('SAMPLE_ANNOTATION', 'relocation_mosquito_dir', str, "relocated_samples/mosquito")
+        return self._normalize_path(raw)
 
-    @property
+    @cached_property
     def RELOCATION_NOT_MOSQUITO_DIR(self):
-        return self.config.get('SAMPLE_ANNOTATION', 'relocation_not_mosquito_dir', fallback="relocated_samples/not_mosquito")
+        raw = self._get('SAMPLE_ANNOTATION', 'relocation_not_mosquito_dir', str, "relocated_samples/not_mosquito")
+        return self._normalize_path(raw)
 
-    @property
+    @cached_property
     def COLAB_NOTEBOOK_DEST_DIR(self):
-        return self.config.get('SAMPLE_ANNOTATION', 'colab_notebook_dest_dir', fallback="./colab_notebooks")
+        raw = self._get('SAMPLE_ANNOTATION', 'colab_notebook_dest_dir', str, "./colab_notebooks")
+        return self._normalize_path(raw)
 
-    @property
+    @cached_property
     def MEDIUM_CONFIDENCE_DIR(self):
-        raw = self.config.get('SAMPLE_ANNOTATION', 'medium_confidence_dir', fallback="medium_confidence")
+        raw = self._get('SAMPLE_ANNOTATION', 'medium_confidence_dir', str, "medium_confidence")
         return self._resolve_under_sample_base(raw)
 
-    @property
+    @cached_property
     def HIGH_CONFIDENCE_DIR(self):
-        raw = self.config.get('SAMPLE_ANNOTATION', 'high_confidence_dir', fallback="high_confidence")
+        raw = self._get('SAMPLE_ANNOTATION', 'high_confidence_dir', str, "high_confidence")
         return self._resolve_under_sample_base(raw)
 
-    @property
+    @cached_property
     def CONFIRMED_MOSQUITO_DIR(self):
-        raw = self.config.get('SAMPLE_ANNOTATION', 'confirmed_mosquito_dir', fallback="confirmed/mosquito")
+        raw = self._get('SAMPLE_ANNOTATION', 'confirmed_mosquito_dir', str, "confirmed/mosquito")
         return self._resolve_under_sample_base(raw)
 
-    @property
+    @cached_property
     def CONFIRMED_NOT_MOSQUITO_DIR(self):
-        raw = self.config.get('SAMPLE_ANNOTATION', 'confirmed_not_mosquito_dir', fallback="confirmed/not_mosquito")
+        raw = self._get('SAMPLE_ANNOTATION', 'confirmed_not_mosquito_dir', str, "confirmed/not_mosquito")
         return self._resolve_under_sample_base(raw)
 
     # 網路相關配置
-    @property
+    @cached_property
     def device_ip(self):
-        configured_ip = self.config.get('NETWORK', 'device_ip', fallback=None)
+        configured_ip = self._get('NETWORK', 'device_ip', str, None)
         if configured_ip is None or configured_ip == "127.0.0.1":
-            return self._get_local_ip()
+            return _get_local_ip()
         return configured_ip
 
-    @property
+    @cached_property
     def external_url(self):
-        url = self.config.get('NETWORK', 'external_url', fallback=None)
+        url = self._get('NETWORK', 'external_url', str, None)
         return url if url else None
 
     # 串流伺服器相關配置
-    @property
+    @cached_property
     def stream_port(self):
-        return self.config.getint('STREAMING_SERVER', 'stream_port', fallback=5000)
+        return self._get('STREAMING_SERVER', 'stream_port', int, 5000)
 
-    @property
+    @cached_property
     def stream_quality(self):
-        return self.config.getint('STREAMING_SERVER', 'stream_quality', fallback=80)
+        return self._get('STREAMING_SERVER', 'stream_quality', int, 80)
 
-    @property
+    @cached_property
     def stream_fps(self):
-        return self.config.getint('STREAMING_SERVER', 'stream_fps', fallback=15)
+        return self._get('STREAMING_SERVER', 'stream_fps', int, 15)
 
-    @property
+    @cached_property
     def rtsp_url(self):
-        return self.config.get('STREAMING_SERVER', 'rtsp_url', fallback="rtsp://0.0.0.0:8554/mosquito")
+        return self._get('STREAMING_SERVER', 'rtsp_url', str, "rtsp://0.0.0.0:8554/mosquito")
 
-    @property
+    @cached_property
     def rtsp_bitrate(self):
-        return self.config.getint('STREAMING_SERVER', 'rtsp_bitrate', fallback=2000)
+        return self._get('STREAMING_SERVER', 'rtsp_bitrate', int, 2000)
 
-    @property
+    @cached_property
     def rtsp_preset(self):
-        return self.config.get('STREAMING_SERVER', 'rtsp_preset', fallback="ultrafast")
+        return self._get('STREAMING_SERVER', 'rtsp_preset', str, "ultrafast")
 
     # 溫度監控相關配置
-    @property
+    @cached_property
     def enable_temperature_monitoring(self):
-        return self.config.getboolean('TEMPERATURE_MONITORING', 'enable_temperature_monitoring', fallback=True)
+        return self._get('TEMPERATURE_MONITORING', 'enable_temperature_monitoring', _BOOL, True)
 
-    @property
+    @cached_property
     def temperature_warning_threshold(self):
-        return self.config.getfloat('TEMPERATURE_MONITORING', 'temperature_warning_threshold', fallback=75.0)
+        return self._get('TEMPERATURE_MONITORING', 'temperature_warning_threshold', float, 75.0)
 
-    @property
+    @cached_property
     def temperature_pause_threshold(self):
-        return self.config.getfloat('TEMPERATURE_MONITORING', 'temperature_pause_threshold', fallback=80.0)
+        return self._get('TEMPERATURE_MONITORING', 'temperature_pause_threshold', float, 80.0)
 
-    @property
+    @cached_property
     def temperature_resume_threshold(self):
-        return self.config.getfloat('TEMPERATURE_MONITORING', 'temperature_resume_threshold', fallback=70.0)
+        return self._get('TEMPERATURE_MONITORING', 'temperature_resume_threshold', float, 70.0)
 
-    @property
+    @cached_property
     def temperature_check_interval(self):
-        return self.config.getfloat('TEMPERATURE_MONITORING', 'temperature_check_interval', fallback=60.0)
+        return self._get('TEMPERATURE_MONITORING', 'temperature_check_interval', float, 60.0)
 
-    @property
+    @cached_property
     def temperature_sensor_path(self):
-        return self.config.get('TEMPERATURE_MONITORING', 'temperature_sensor_path', fallback="/sys/class/thermal/thermal_zone0/temp")
+        return self._get('TEMPERATURE_MONITORING', 'temperature_sensor_path', str, "/sys/class/thermal/thermal_zone0/temp")
 
     # 光照度監控相關配置
-    @property
+    @cached_property
     def enable_illumination_monitoring(self):
-        return self.config.getboolean('ILLUMINATION_MONITORING', 'enable_illumination_monitoring', fallback=True)
+        return self._get('ILLUMINATION_MONITORING', 'enable_illumination_monitoring', _BOOL, True)
 
-    @property
+    @cached_property
     def illumination_warning_threshold(self):
-        return self.config.getint('ILLUMINATION_MONITORING', 'illumination_warning_threshold', fallback=60)
+        return self._get('ILLUMINATION_MONITORING', 'illumination_warning_threshold', int, 60)
 
-    @property
+    @cached_property
     def illumination_pause_threshold(self):
-        return self.config.getint('ILLUMINATION_MONITORING', 'illumination_pause_threshold', fallback=40)
+        return self._get('ILLUMINATION_MONITORING', 'illumination_pause_threshold', int, 40)
 
-    @property
+    @cached_property
     def illumination_check_interval(self):
-        return self.config.getfloat('ILLUMINATION_MONITORING', 'illumination_check_interval', fallback=5.0)
+        return self._get('ILLUMINATION_MONITORING', 'illumination_check_interval', float, 5.0)
 
     # 攝像頭相關配置
-    @property
+    @cached_property
     def camera_dual_width(self):
-        return self.config.getint('CAMERA', 'camera_dual_width', fallback=3840)
+        return self._get('CAMERA', 'camera_dual_width', int, 3840)
 
-    @property
+    @cached_property
     def camera_dual_height(self):
-        return self.config.getint('CAMERA', 'camera_dual_height', fallback=1080)
+        return self._get('CAMERA', 'camera_dual_height', int, 1080)
 
-    @property
+    @cached_property
     def camera_dual_fps(self):
-        return self.config.getint('CAMERA', 'camera_dual_fps', fallback=60)
+        return self._get('CAMERA', 'camera_dual_fps', int, 60)
 
-    @property
+    @cached_property
     def frame_delay(self):
-        return self.config.getfloat('CAMERA', 'frame_delay', fallback=0.03)
+        return self._get('CAMERA', 'frame_delay', float, 0.03)
 
     # 串口相關配置
-    @property
+    @cached_property
     def arduino_baudrate(self):
-        return self.config.getint('SERIAL', 'arduino_baudrate', fallback=115200)
+        return self._get('SERIAL', 'arduino_baudrate', int, 115200)
 
-    @property
+    @cached_property
     def arduino_timeout(self):
-        return self.config.getfloat('SERIAL', 'arduino_timeout', fallback=1.0)
+        return self._get('SERIAL', 'arduino_timeout', float, 1.0)
 
     # 深度估計相關配置
-    @property
+    @cached_property
     def depth_focal_length(self):
-        return self.config.getfloat('DEPTH_ESTIMATION', 'depth_focal_length', fallback=3.0)
+        return self._get('DEPTH_ESTIMATION', 'depth_focal_length', float, 3.0)
 
-    @property
+    @cached_property
     def depth_baseline(self):
-        return self.config.getfloat('DEPTH_ESTIMATION', 'depth_baseline', fallback=120.0)
+        return self._get('DEPTH_ESTIMATION', 'depth_baseline', float, 120.0)
 
-    @property
+    @cached_property
     def depth_sensor_width(self):
-        return self.config.getfloat('DEPTH_ESTIMATION', 'depth_sensor_width', fallback=5.0)
+        return self._get('DEPTH_ESTIMATION', 'depth_sensor_width', float, 5.0)
 
     # 追蹤相關配置
-    @property
+    @cached_property
     def position_update_interval(self):
-        return self.config.getfloat('TRACKER', 'position_update_interval', fallback=0.5)
+        return self._get('TRACKER', 'position_update_interval', float, 0.5)
 
 
 # 創建全局配置實例
-config = ConfigLoader()
\ No newline at end of file
+config = ConfigLoader()
+
+
+def _snapshot():
+    """將熱路徑配置值物化為模組級常量
+
+    逐幀迴圈中 `config.imgsz` 仍需屬性查找；下游以
+    `from config_loader import IMGSZ` 取用時只剩一次 LOAD_GLOBAL。
+    """
+    g = globals()
+    g['IMGSZ'] = config.imgsz
+    g['CONFIDENCE_THRESHOLD'] = config.confidence_threshold
+    g['IOU_THRESHOLD'] = config.iou_threshold
+    g['DETECTION_MODE'] = config.detection_mode
+    g['TILE_OVERLAP'] = config.tile_overlap
+    g['DETECTION_MARGIN'] = config.detection_margin
+    g['PAN_GAIN'] = config.pan_gain
+    g['TILT_GAIN'] = config.tilt_gain
+    g['NO_DETECTION_TIMEOUT'] = config.no_detection_timeout
+    g['TARGET_LOCK_DISTANCE'] = config.target_lock_distance
+    g['FRAME_DELAY'] = config.frame_delay
+    g['MIN_BBOX_SIZE_PX'] = config.min_bbox_size_px
+    g['MAX_BBOX_SIZE_PX'] = config.max_bbox_size_px
+    g['MIN_ASPECT_RATIO'] = config.min_aspect_ratio
+    g['MAX_ASPECT_RATIO'] = config.max_aspect_ratio
+
+
+def reload():
+    """重新載入配置文件並刷新模組級常量"""
+    config.invalidate()
+    config._load()
+    _snapshot()
+
+
+_snapshot()
+
+
+if __name__ == "__main__":
+    # python config_loader.py --dump-json：由 ini 生成等價的 mosquito.json 快照
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="配置工具")
+    parser.add_argument("--dump-json", action="store_true",
+                        help="輸出與當前 ini 等價的 mosquito.json 快照")
+    args = parser.parse_args()
+
+    if args.dump_json:
+        out = config.config_path.with_name("mosquito.json")
+        with open(out, 'w', encoding='utf-8') as f:
+            json.dump(config._data, f, indent=2, ensure_ascii=False)
+        print(f"✅ 已輸出 JSON 快照: {out}")
+    else:
+        parser.print_help()
+        sys.exit(1)
\ No newline at end of file
@@ -53,9 +53,10 @@ def send_servo_id_config(port: str, servo_id: int) -> bool:
 
     try:
         # 連接到 Arduino
+        # 短 timeout 讓 read_until 以阻塞等待逐行返回，而非空轉輪詢
         print(f"正在連接到 {port}...")
-        ser = serial.Serial(port, 115200, timeout=2)
-        time.sleep(1)  # 等待初始化
+        ser = serial.Serial(port, 115200, timeout=0.05)
+        time.sleep(0.2)  # DTR 重啟後 bootloader 約 150ms 內完成，無需等滿 1 秒
 
         print(f"✅ 已連接")
 
@@ -72,26 +73,25 @@ def send_servo_id_config(port: str, servo_id: int) -> bool:
         print(f"  Arduino 命令: {command.strip()}")
 
         # 發送命令到 Arduino
+        # 20 字節的命令行直接進 UART TX FIFO，毋須 flush() 阻塞等待排空
         print(f"\n發送命令到 Arduino...")
         ser.write(command.encode())
-        ser.flush()
 
         print(f"✅ 命令已發送")
 
-        # 等待響應
+        # 等待響應（由下方 read_until 迴圈負責計時，不額外睡眠）
         print(f"\n等待 Arduino 確認...")
-        time.sleep(1)
 
-        # 讀取響應
+        # 讀取響應：read_until 在換行到達時立即返回，
+        # 等待期間阻塞在 OS 層，CPU 佔用趨近於零
         responses = []
-        start_time = time.time()
-
-        while time.time() - start_time < 2:
-            if ser.in_waiting > 0:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
-                if line:
-                    responses.append(line)
-                    print(f"  收到: {line}")
+        deadline = time.monotonic() + 2.0
+
+        while time.monotonic() < deadline:
+            line = ser.read_until(b'\n').decode('utf-8', errors='ignore').strip()
+            if line:
+                responses.append(line)
+                print(f"  收到: {line}")
 
         ser.close()
 
@@ -30,9 +30,12 @@
 - 系統會自動選擇對應平台的模型格式進行推理
 """
 
+import filecmp
 import os
 import sys
 import shutil
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import argparse
@@ -44,6 +47,74 @@ except ImportError as e:
         sys.exit(1)
 
 
+def _fast_copy(src: Path, dst: Path, bufsize: int = 4 * 1024 * 1024):
+    """大檔複製（多 MB 模型專用）
+
+    shutil.copy2 的跨檔案系統路徑可能退化為 8 KiB 讀寫迴圈；
+    這裡優先用核心態 os.sendfile，否則以 4 MiB 緩衝 copyfileobj，
+    將 syscall 數降低數百倍，最後以 copystat 保留元數據（等價 copy2）。
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        # 同一檔案系統優先 copy_file_range：btrfs/xfs 會走 reflink（O(1)
+        # 元數據操作，完全不讀寫資料），其他 FS 退化為核心態複製
+        if hasattr(os, 'copy_file_range'):
+            try:
+                if os.fstat(fsrc.fileno()).st_dev == os.stat(dst.parent).st_dev:
+                    size = os.fstat(fsrc.fileno()).st_size
+                    offset = 0
+                    while offset < size:
+                        copied = os.copy_file_range(
+                            fsrc.fileno(), fdst.fileno(), size - offset)
+                        if copied == 0:
+                            break
+                        offset += copied
+                    if offset >= size:
+                        shutil.copystat(str(src), str(dst))
+                        return
+                    fsrc.seek(0)
+                    fdst.seek(0)
+                    fdst.truncate()
+            except OSError:
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        if hasattr(os, 'sendfile'):
+            try:
+                offset = 0
+                size = os.fstat(fsrc.fileno()).st_size
+                while offset < size:
+                    sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                if offset >= size:
+                    shutil.copystat(str(src), str(dst))
+                    return
+            except OSError:
+                # FUSE（Google Drive 掛載）等不支援 sendfile，退回緩衝複製
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst, bufsize)
+    shutil.copystat(str(src), str(dst))
+
+
+def _same_content(src: Path, dst: Path) -> bool:
+    """目標檔是否已與來源檔一致（最快的複製是不複製）
+
+    先比 (size, mtime_ns) 這兩個 stat 欄位；大小相同但 mtime 不同時
+    才逐位元組比對確認。無論結果為何都遠比盲目重複複製便宜。
+    """
+    if not dst.exists():
+        return False
+    sa, sb = src.stat(), dst.stat()
+    if sa.st_size != sb.st_size:
+        return False
+    if sa.st_mtime_ns == sb.st_mtime_ns:
+        return True
+    return filecmp.cmp(str(src), str(dst), shallow=False)
+
+
 def backup_existing_models(local_models_dir: Path):
     """備份現有的模型文件"""
     backup_files = [
@@ -54,24 +125,44 @@ def backup_existing_models(local_models_dir: Path):
     ]
 
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_dir = local_models_dir / f"backup_{timestamp}"
-    backed_up = False
 
+    # 最近一次備份檔：內容未變的模型不必再備份一份
+    # （以 tar 成員的 size+mtime 比對，免解壓）
+    previous_backups = sorted(local_models_dir.glob("backup_*.tar")) if local_models_dir.exists() else []
+    latest_members = {}
+    if previous_backups:
+        try:
+            with tarfile.open(previous_backups[-1]) as tar:
+                latest_members = {m.name: m for m in tar.getmembers()}
+        except tarfile.TarError:
+            latest_members = {}
+
+    to_backup = []
     for filename in backup_files:
         src = local_models_dir / filename
-        if src.exists():
-            if not backed_up:
-                backup_dir.mkdir(parents=True, exist_ok=True)
-                backed_up = True
-            dst = backup_dir / filename
-            shutil.copy2(str(src), str(dst))
-            size_mb = src.stat().st_size / 1024 / 1024
-            print(f"[BACKUP] {filename} → {backup_dir.name}/ ({size_mb:.2f} MB)")
+        if not src.exists():
+            continue
+        member = latest_members.get(filename)
+        st = src.stat()
+        if member is not None and member.size == st.st_size and int(member.mtime) == int(st.st_mtime):
+            print(f"[SKIP] {filename} 與最近備份一致，跳過")
+            continue
+        to_backup.append(src)
 
-    if backed_up:
-        print(f"✅ 舊模型已備份至: {backup_dir}\n")
-    else:
+    if not to_backup:
         print("[INFO] 無現有模型需要備份\n")
+        return
+
+    # 四個檔案串流進單一 tar：一個輸出控制代碼、一條大段順序寫入，
+    # 取代每檔 open/copy/close/chmod 的零散 syscall
+    tar_path = local_models_dir / f"backup_{timestamp}.tar"
+    with tarfile.open(tar_path, "w", bufsize=1024 * 1024) as tar:
+        for src in to_backup:
+            tar.add(src, arcname=src.name)
+            size_mb = src.stat().st_size / 1024 / 1024
+            print(f"[BACKUP] {src.name} → {tar_path.name} ({size_mb:.2f} MB)")
+
+    print(f"✅ 舊模型已備份至: {tar_path}\n")
 
 
 def copy_all_models_from_drive(local_models_dir: Path) -> dict:
@@ -94,18 +185,27 @@ def copy_all_models_from_drive(local_models_dir: Path) -> dict:
         "mosquito_yolov8.bin": "mosquito_yolov8.bin",
     }
 
-    copied = {}
-    for src_name, dst_name in model_files.items():
+    def _copy_one(src_name: str, dst_name: str):
         src = training_models / src_name
         dst = local_models_dir / dst_name
-
-        if src.exists():
-            shutil.copy2(str(src), str(dst))
+        if not src.exists():
+            return dst_name, None, f"[SKIP] {src_name} 不存在，跳過"
+        if _same_content(src, dst):
             size_mb = dst.stat().st_size / 1024 / 1024
-            print(f"[OK] 已複製 {dst_name} ({size_mb:.2f} MB)")
-            copied[dst_name] = dst
-        else:
-            print(f"[SKIP] {src_name} 不存在，跳過")
+            return dst_name, dst, f"[OK] {dst_name} 已是最新，跳過複製 ({size_mb:.2f} MB)"
+        _fast_copy(src, dst)
+        size_mb = dst.stat().st_size / 1024 / 1024
+        return dst_name, dst, f"[OK] 已複製 {dst_name} ({size_mb:.2f} MB)"
+
+    # 四個模型檔併行複製：Drive FUSE 讀取延遲與本地寫入互相重疊，
+    # sendfile/copyfileobj 在 C 層釋放 GIL，執行緒即可吃滿儲存並行度
+    copied = {}
+    with ThreadPoolExecutor(max_workers=len(model_files)) as pool:
+        for dst_name, dst, message in pool.map(
+                lambda kv: _copy_one(*kv), model_files.items()):
+            print(message)
+            if dst is not None:
+                copied[dst_name] = dst
 
     if not copied:
         raise FileNotFoundError(f"未找到任何模型文件在 {training_models}\n請確認 Colab 已完成訓練並生成模型")
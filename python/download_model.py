@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# Copyright 2025 Arduino PT2D Project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+模型下載工具
+
+功能：
+1) 從 URL 串流下載模型權重到 models/ 目錄
+2) 1 MB 分塊寫入：峰值記憶體與檔案大小無關（>100 MB 權重也只佔 1 MB）
+3) 支援斷點續傳（HTTP Range），下載中斷後重跑即接續
+
+使用方式：
+  python download_model.py                          # 下載預設 YOLOv8n 權重
+  python download_model.py --url <URL>              # 下載指定模型
+  python download_model.py --url <URL> --output ../models/mosquito_yolov8.pt
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError as e:
+    print(f"[ERROR] 無法載入 requests 模組: {e}")
+    print("請執行: pip install requests")
+    sys.exit(1)
+
+# 預設下載 YOLOv8n 基礎權重（訓練用起點）
+DEFAULT_MODEL_URL = (
+    "https://github.com/ultralytics/assets/releases/download/v8.3.0/yolov8n.pt"
+)
+
+# 模型目錄在模組層解析一次，所有路徑計算共用同一個 Path 物件
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB 分塊
+
+
+def download_model_from_url(url: str, models_path: Path,
+                            chunk_size: int = CHUNK_SIZE) -> bool:
+    """
+    串流下載模型到指定路徑
+
+    使用 requests 的 stream 模式逐塊寫入，不在記憶體中緩存整個檔案；
+    先寫入 .part 暫存檔，已有部分內容時以 Range 標頭接續，
+    完成後以 os.replace 原子換名，不會留下半成品檔。
+
+    Args:
+        url: 模型下載 URL
+        models_path: 目標檔案路徑
+        chunk_size: 每塊寫入大小（位元組）
+
+    Returns:
+        True 如果下載成功，False 如果失敗
+    """
+    models_path = Path(models_path)
+    models_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = models_path.with_suffix(models_path.suffix + ".part")
+
+    # 關閉傳輸壓縮：權重本身已壓縮，identity 才能正確使用 Range 續傳
+    headers = {"Accept-Encoding": "identity"}
+    resume_from = 0
+    if part_path.exists():
+        resume_from = part_path.stat().st_size
+        headers["Range"] = f"bytes={resume_from}-"
+        print(f"[INFO] 發現未完成下載，從 {resume_from / 1024 / 1024:.1f} MB 處續傳")
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+    try:
+        with session.get(url, stream=True, timeout=30, headers=headers) as r:
+            if resume_from and r.status_code == 200:
+                # 伺服器不支援 Range：從頭重下
+                print("[WARN] 伺服器不支援續傳，重新下載")
+                resume_from = 0
+            r.raise_for_status()
+
+            total = r.headers.get("Content-Length")
+            total_mb = (int(total) + resume_from) / 1024 / 1024 if total else None
+
+            mode = "ab" if resume_from else "wb"
+            written = resume_from
+            with open(part_path, mode) as f:
+                for chunk in r.iter_content(chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+                    if total_mb:
+                        print(f"\r[下載] {written / 1024 / 1024:.1f} / {total_mb:.1f} MB",
+                              end="", flush=True)
+                    else:
+                        print(f"\r[下載] {written / 1024 / 1024:.1f} MB",
+                              end="", flush=True)
+            print()
+
+        os.replace(part_path, models_path)
+        size_mb = models_path.stat().st_size / 1024 / 1024
+        print(f"✅ 下載完成: {models_path} ({size_mb:.2f} MB)")
+        return True
+
+    except requests.RequestException as e:
+        print(f"\n[ERROR] 下載失敗: {e}")
+        if part_path.exists():
+            print(f"[INFO] 已保留部分下載 {part_path.name}，重跑可續傳")
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="下載模型權重到 models/ 目錄")
+    parser.add_argument("--url", default=DEFAULT_MODEL_URL,
+                        help="模型下載 URL（預設 YOLOv8n 基礎權重）")
+    parser.add_argument("--output", default=None,
+                        help="目標檔案路徑（預設 ../models/<URL 檔名>）")
+    args = parser.parse_args()
+
+    if args.output:
+        models_path = Path(args.output)
+    else:
+        models_path = MODELS_DIR / Path(args.url).name
+
+    print("=" * 60)
+    print("模型下載工具")
+    print("=" * 60)
+    print(f"來源: {args.url}")
+    print(f"目標: {models_path}")
+    print()
+
+    if not download_model_from_url(args.url, models_path):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
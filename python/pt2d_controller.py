@@ -52,6 +52,10 @@ class PT2DController:
         
         self.servo_enabled = False  # 初始為禁用，只有在成功初始化後才啟用
 
+        # 雷射 / LED 狀態快取：狀態未變時跳過串口往返
+        self._laser_state = None
+        self._led_state = None
+
         # 角度限制（初始值，會由 Arduino 動態設置）
         self.pan_min = 0
         self.pan_max = 270
@@ -451,21 +455,46 @@ class PT2DController:
         """
         設置 LED 狀態（固件 <LED:ON|OFF>）
 
+        狀態未改變時直接返回快取結果，省去一整趟串口往返
+        （flush + write + 50ms 等待 + 讀取響應）；
+        追蹤迴圈可放心每幀呼叫而不阻塞。
+
         Args:
             state: True/'ON' 開啟，False/'OFF' 關閉
         """
         val = 'ON' if (isinstance(state, bool) and state or (isinstance(state, str) and state.upper() == 'ON')) else 'OFF'
-        return self.send_command(f'LED:{val}')
+        if val == self._led_state:
+            return {'status': 'ok', 'message': f'LED_{val}', 'cached': True}
+        result = self.send_command(f'LED:{val}')
+        if result.get('status') == 'ok':
+            self._led_state = val
+        return result
 
     def set_laser(self, state: Union[bool, str]) -> Dict:
         """
         設置雷射狀態（固件 <LASER:ON|OFF>）
 
+        與 set_led 相同的狀態快取：實際脈衝時序由固件的
+        digitalWrite 處理，Python 端只需在狀態改變時下指令。
+
         Args:
             state: True/'ON' 開啟，False/'OFF' 關閉
         """
         val = 'ON' if (isinstance(state, bool) and state or (isinstance(state, str) and state.upper() == 'ON')) else 'OFF'
-        return self.send_command(f'LASER:{val}')
+        if val == self._laser_state:
+            return {'status': 'ok', 'message': f'LASER_{val}', 'cached': True}
+        result = self.send_command(f'LASER:{val}')
+        if result.get('status') == 'ok':
+            self._laser_state = val
+        return result
+
+    def laser_on(self) -> Dict:
+        """開啟雷射（set_laser 快捷方法）"""
+        return self.set_laser(True)
+
+    def laser_off(self) -> Dict:
+        """關閉雷射（set_laser 快捷方法）"""
+        return self.set_laser(False)
 
     # 總線指令快捷方法（橋接模式）
     def bus_move(self, servo_id: int, position: int, time_ms: int) -> Dict:
@@ -668,15 +668,23 @@ class StreamingTrackingSystem:
 
             # 🎯 深度估計與尺寸過濾（如果啟用且有右眼影像）
             if self.depth_estimator and right_frame is not None:
+                # 先收集整幀所有 bbox，批量估計深度（SGBM 只跑一次）
+                # 單通道轉換在邊界做一次；取綠色通道對 SGBM 等效
+                # 且比 cvtColor 的加權和便宜（與 DepthEstimator._to_gray 一致）
+                left_gray = cv2.extractChannel(left_frame, 1)
+                right_gray = cv2.extractChannel(right_frame, 1)
+                with_bbox = [d for d in detections if d.get('bbox')]
+                depth_infos = self.depth_estimator.estimate_depth_for_detections(
+                    left_gray, right_gray,
+                    [tuple(d['bbox']) for d in with_bbox]
+                )
+                depth_by_id = {id(d): info for d, info in zip(with_bbox, depth_infos)}
+
                 valid_detections = []
                 for detection in detections:
                     bbox = detection.get('bbox')
                     if bbox:
-                        x1, y1, x2, y2 = bbox
-                        # 估計深度與實際尺寸
-                        depth_info = self.depth_estimator.estimate_depth_for_detection(
-                            left_frame, right_frame, (x1, y1, x2, y2)
-                        )
+                        depth_info = depth_by_id.get(id(detection))
                         if depth_info:
                             detection['depth'] = depth_info['depth']
                             detection['distance_cm'] = depth_info['distance_cm']